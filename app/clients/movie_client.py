@@ -1,5 +1,7 @@
 import asyncio
-from typing import List, Tuple
+import heapq
+from operator import attrgetter
+from typing import Awaitable, Callable, List, Tuple
 import httpx
 from ..schemas.movies_schemas import MovieResponse, MovieSearchParams
 from ..utils.utils_movies_client import (
@@ -8,11 +10,15 @@ from ..utils.utils_movies_client import (
     discover_by_filters,
     get_popular,
     map_to_movie,
-    matches,
+    matches_lowered,
+    prefetch_cached_details,
 )
 
 
-async def search_tmdb(params: MovieSearchParams) -> List[MovieResponse]:
+async def search_tmdb(
+    params: MovieSearchParams,
+    client: httpx.AsyncClient
+) -> List[MovieResponse]:
     """
     Search for movies or TV series based on the provided parameters
     This function acts as a wrapper to handle different search scenarios:
@@ -22,27 +28,29 @@ async def search_tmdb(params: MovieSearchParams) -> List[MovieResponse]:
     - Popular fallback when no specific criteria are provided
 
     :param params: MovieSearchParams object containing search criteria
+    :param client: Shared HTTP client for making API requests
     :return: List of MovieResponse objects matching the search criteria
     """
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        is_series = params.type == 'series'
-        has_title = bool(params.title)
-        has_filters = any([params.genre, params.actors, params.type])
-
-        if has_title and not has_filters:
-            return await _search_by_title_only(client, params, is_series)
-        elif has_title and has_filters:
-            return await _search_by_title_with_filters(client, params, is_series)
-        elif has_filters:
-            return await _search_by_filters_only(client, params, is_series)
-        else:
-            return await _get_popular_fallback(client, params)
+    is_series = params.type == 'series'
+    has_title = bool(params.title)
+    has_filters = any([params.genre, params.actors, params.type])
+
+    if has_title and not has_filters:
+        return await _search_by_title_only(client, params, is_series)
+    elif has_title and has_filters:
+        return await _search_by_title_with_filters(client, params, is_series)
+    elif has_filters:
+        return await _search_by_filters_only(client, params, is_series)
+    else:
+        return await _get_popular_fallback(client, params)
 
 
 async def _search_by_title_only(
     client: httpx.AsyncClient,
     params: MovieSearchParams,
-    is_series: bool
+    is_series: bool,
+    *,
+    mapper: Callable[..., Awaitable[MovieResponse]] = map_to_movie
 ) -> List[MovieResponse]:
     """
     Perform a title-only search for movies or TV series.
@@ -51,18 +59,22 @@ async def _search_by_title_only(
     :param client: HTTP client for making API requests
     :param params: MovieSearchParams object containing the title.
     :param is_series: Boolean indicating if the search is for series.
+    :param mapper: Per-item mapping coroutine; injectable in tests and a
+        local-variable dispatch in the gather loop.
     :return: List of MovieResponse objects matching the title.
     """
     endpoints = ['tv', 'movie'] if not params.type else [
         'tv'] if is_series else ['movie']
     movies: List[MovieResponse] = []
     for ep in endpoints:
-        results, endpoint = await get_search_results(
-            client, params.title, ep == 'tv'
+        (results, endpoint), genres = await asyncio.gather(
+            get_search_results(client, params.title, ep == 'tv'),
+            fetch_genres(client, ep == 'tv')
         )
-        genres = await fetch_genres(client, ep == 'tv')
+        prefetched = await prefetch_cached_details(
+            [(item, endpoint) for item in results])
         movies += await asyncio.gather(*[
-            map_to_movie(item, endpoint, genres, params, client)
+            mapper(item, endpoint, genres, params, client, prefetched)
             for item in results
         ])
     return movies
@@ -71,7 +83,9 @@ async def _search_by_title_only(
 async def _search_by_title_with_filters(
     client: httpx.AsyncClient,
     params: MovieSearchParams,
-    is_series: bool
+    is_series: bool,
+    *,
+    mapper: Callable[..., Awaitable[MovieResponse]] = map_to_movie
 ) -> List[MovieResponse]:
     """
     Perform a search by title with additional filters (genre, actors)
@@ -80,8 +94,11 @@ async def _search_by_title_with_filters(
     :param client: HTTP client for making API requests
     :param params: MovieSearchParams object containing title and filters
     :param is_series: Boolean indicating if the search is for series
+    :param mapper: Per-item mapping coroutine; injectable in tests and a
+        local-variable dispatch in the gather loop.
     :return: List of MovieResponse objects matching the criteria
     """
+    genres = await fetch_genres(client, is_series)
     if params.actors and is_series:
         data, endpoint = await discover_by_filters(
             client, params.genre, params.actors, is_series
@@ -90,18 +107,33 @@ async def _search_by_title_with_filters(
         data, endpoint = await get_search_results(
             client, params.title, is_series
         )
-    genres = await fetch_genres(client, is_series)
+        if params.genre:
+            # Drop items that can't match the genre filter before paying
+            # the per-item enrichment cost; matches() still applies the
+            # actor filter after mapping.
+            gid = next(
+                (i for i, n in genres.items()
+                 if n.lower() == params.genre.lower()), None
+            )
+            data = [r for r in data if gid in r.get('genre_ids', [])]
+    prefetched = await prefetch_cached_details(
+        [(item, endpoint) for item in data])
     mapped = await asyncio.gather(*[
-        map_to_movie(item, endpoint, genres, params, client)
+        mapper(item, endpoint, genres, params, client, prefetched)
         for item in data
     ])
-    return [m for m in mapped if matches(m, params)]
+    genre_lc = params.genre.casefold() if params.genre else None
+    actors_lc = params.actors.casefold() if params.actors else None
+    return [m for m in mapped
+            if matches_lowered(m, params.type, genre_lc, actors_lc)]
 
 
 async def _search_by_filters_only(
     client: httpx.AsyncClient,
     params: MovieSearchParams,
-    is_series: bool
+    is_series: bool,
+    *,
+    mapper: Callable[..., Awaitable[MovieResponse]] = map_to_movie
 ) -> List[MovieResponse]:
     """
     Perform a search using only filters (genre, actors) without a title
@@ -109,22 +141,31 @@ async def _search_by_filters_only(
     :param client: HTTP client for making API requests
     :param params: MovieSearchParams object containing filters.
     :param is_series: Boolean indicating if the search is for series
+    :param mapper: Per-item mapping coroutine; injectable in tests and a
+        local-variable dispatch in the gather loop.
     :return: List of MovieResponse objects matching the filters.
     """
     data, endpoint = await discover_by_filters(
         client, params.genre, params.actors, is_series
     )
     genres = await fetch_genres(client, is_series)
+    prefetched = await prefetch_cached_details(
+        [(item, endpoint) for item in data])
     mapped = await asyncio.gather(*[
-        map_to_movie(item, endpoint, genres, params, client)
+        mapper(item, endpoint, genres, params, client, prefetched)
         for item in data
     ])
-    return [m for m in mapped if matches(m, params)]
+    genre_lc = params.genre.casefold() if params.genre else None
+    actors_lc = params.actors.casefold() if params.actors else None
+    return [m for m in mapped
+            if matches_lowered(m, params.type, genre_lc, actors_lc)]
 
 
 async def _get_popular_fallback(
     client: httpx.AsyncClient,
-    params: MovieSearchParams
+    params: MovieSearchParams,
+    *,
+    mapper: Callable[..., Awaitable[MovieResponse]] = map_to_movie
 ) -> List[MovieResponse]:
     """
     Retrieve popular movies and TV series as a fallback when no specific search
@@ -132,11 +173,15 @@ async def _get_popular_fallback(
 
     :param client: HTTP client for making API requests.
     :param params: MovieSearchParams object (unused in this function)
+    :param mapper: Per-item mapping coroutine; injectable in tests and a
+        local-variable dispatch in the gather loop.
     :return: List of up to 20 popular MovieResponse objects
     """
-    movie_pop, tv_pop = await asyncio.gather(
+    movie_pop, tv_pop, genres_movie, genres_tv = await asyncio.gather(
         get_popular(client, False),
-        get_popular(client, True)
+        get_popular(client, True),
+        fetch_genres(client, False),
+        fetch_genres(client, True)
     )
     raw: List[Tuple[dict, str]] = [
         (i, 'movie') for i in movie_pop
@@ -144,13 +189,16 @@ async def _get_popular_fallback(
         (i, 'tv') for i in tv_pop
     ]
     genres_map = {
-        'movie': await fetch_genres(client, False),
-        'tv': await fetch_genres(client, True)
+        'movie': genres_movie,
+        'tv': genres_tv
     }
+    prefetched = await prefetch_cached_details(raw)
     results = await asyncio.gather(*[
-        map_to_movie(item, t, genres_map[t], params, client)
+        mapper(item, t, genres_map[t], params, client, prefetched)
         for item, t in raw
     ])
     if not params.title:
-        results.sort(key=lambda m: m.title)
+        # Only the top 20 titles are returned, so an O(N log 20) partial
+        # sort with a C-level key beats sorting both full pages.
+        return heapq.nsmallest(20, results, key=attrgetter('title'))
     return results[:20]
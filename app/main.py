@@ -1,15 +1,136 @@
-from fastapi import FastAPI, HTTPException, Depends
+import asyncio
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse
+import httpx
 from .schemas.movies_schemas import MovieSearchParams, MovieResponse, ErrorResponse
 from .clients.movie_client import search_tmdb
+from .utils.utils_movies_client import (
+    CACHE_TTL_GENRES,
+    CACHE_TTL_POPULAR,
+    fetch_genres,
+    invalidate_genres,
+    invalidate_responses,
+    refresh_popular,
+)
 from typing import List
 
-app = FastAPI()
+# orjson serializes the nested movie payloads several times faster than
+# the stdlib json encoder FastAPI uses by default.
+app = FastAPI(default_response_class=ORJSONResponse)
 
 
-@app.get('/movies/search', response_model=List[MovieResponse], responses={502: {'model': ErrorResponse}})
-async def search_movies(params: MovieSearchParams = Depends()):
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build the shared outbound HTTP client used for all TMDB/OMDB calls.
+    A single long-lived client keeps connections (and TLS sessions) pooled
+    across requests instead of re-handshaking on every search.
+    """
+    return httpx.AsyncClient(
+        # A tighter connect timeout fails fast on unreachable upstreams
+        # without shrinking the overall budget for slow responses.
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        # Both upstreams (TMDB, OMDB) speak HTTP/2, so burst enrichment
+        # multiplexes over a couple of connections instead of racing for
+        # pooled HTTP/1.1 sockets.
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=100, max_keepalive_connections=50,
+            keepalive_expiry=30.0)
+    )
+
+
+@app.on_event("startup")
+async def open_http_client():
+    app.state.http = create_http_client()
+
+
+@app.on_event("startup")
+async def preload_genres():
+    # Warm the genre caches (in-process and Redis) off the critical path
+    # so the first searches don't pay the TMDB lookup, then re-warm once
+    # per TTL window to keep Redis populated without a restart.
+    async def _warm():
+        try:
+            await asyncio.gather(
+                fetch_genres(app.state.http, False),
+                fetch_genres(app.state.http, True)
+            )
+        except Exception:
+            # best effort; searches fall back to the lazy fetch path
+            pass
+
+    async def _warm_loop():
+        await _warm()
+        while True:
+            await asyncio.sleep(CACHE_TTL_GENRES)
+            await _warm()
+    app.state.genre_warmer = asyncio.create_task(_warm_loop())
+
+
+@app.on_event("startup")
+async def start_popular_refresher():
+    # Proactively re-cache the popular lists every TTL window so the
+    # first user after an expiry never pays the TMDB round-trip.
+    async def _refresh_loop():
+        while True:
+            await asyncio.sleep(CACHE_TTL_POPULAR)
+            try:
+                await refresh_popular(app.state.http)
+            except Exception:
+                # best effort; the Redis TTL safety net still applies
+                pass
+    app.state.popular_refresher = asyncio.create_task(_refresh_loop())
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    for name in ("genre_warmer", "popular_refresher"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    client = getattr(app.state, "http", None)
+    if client is not None:
+        await client.aclose()
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """
+    Dependency returning the shared HTTP client, creating it lazily when
+    the app runs without its startup events (e.g. under TestClient).
+    """
+    client = getattr(request.app.state, "http", None)
+    if client is None:
+        client = request.app.state.http = create_http_client()
+    return client
+
+
+@app.post('/admin/cache/invalidate', responses={400: {'model': ErrorResponse}})
+async def invalidate_cache(scope: str):
+    """
+    Explicitly drop a cache scope instead of waiting for TTL expiry,
+    e.g. after TMDB updates its genre list.
+    """
+    if scope == 'genres':
+        await invalidate_genres()
+        return {'invalidated': 'genres'}
+    if scope == 'responses':
+        invalidate_responses()
+        return {'invalidated': 'responses'}
+    raise HTTPException(
+        status_code=400, detail=f"Unknown cache scope: {scope}")
+
+
+@app.get('/movies/search', response_model=List[MovieResponse],
+         responses={502: {'model': ErrorResponse}, 503: {'model': ErrorResponse}})
+async def search_movies(
+    params: MovieSearchParams = Depends(),
+    client: httpx.AsyncClient = Depends(get_http_client)
+):
     try:
-        movies = await search_tmdb(params)
+        movies = await search_tmdb(params, client)
+    except httpx.TimeoutException as e:
+        raise HTTPException(
+            status_code=503, detail=f"Upstream service timed out: {str(e)}")
     except Exception as e:
         raise HTTPException(
             status_code=502, detail=f"TMDB service error: {str(e)}")
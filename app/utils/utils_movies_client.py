@@ -1,6 +1,11 @@
-import json
+import asyncio
+import time
+from dataclasses import dataclass
 import httpx
+import orjson
 import redis.asyncio as redis
+import zstandard as zstd
+from cachetools import TTLCache
 from typing import Dict, List, Optional, Tuple
 from ..config import settings
 from ..schemas.movies_schemas import MovieResponse, MovieSearchParams
@@ -8,6 +13,22 @@ from ..schemas.movies_schemas import MovieResponse, MovieSearchParams
 # Redis client
 _redis = redis.from_url(
     settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+# Raw (bytes) Redis client for zstd-compressed entries; the z: key
+# prefix keeps them apart from the plain JSON keys above.
+_redis_raw = redis.from_url(settings.REDIS_URL, decode_responses=False)
+
+_zstd_compressor = zstd.ZstdCompressor(level=3)
+_zstd_decompressor = zstd.ZstdDecompressor()
+
+
+def _compress(payload: bytes) -> bytes:
+    """Compress serialized JSON for storage under a z:-prefixed key."""
+    return _zstd_compressor.compress(payload)
+
+
+def _decompress(raw: bytes) -> bytes:
+    """Inverse of _compress for values read from z:-prefixed keys."""
+    return _zstd_decompressor.decompress(raw)
 TMDB_API_KEY = settings.TMDB_API_KEY
 OMDB_API_KEY = settings.OMDB_API_KEY
 BASE_URL = 'https://api.themoviedb.org/3'
@@ -15,7 +36,155 @@ OMDB_BASE_URL = 'http://www.omdbapi.com/'
 
 CACHE_TTL_POPULAR = 600    # 10 minutes
 CACHE_TTL_OMDB = 3600      # 1 hour
+CACHE_TTL_OMDB_MISS = 300  # 5 minutes for titles with no OMDB data
 CACHE_TTL_SEARCH = 3600    # 1 hour
+CACHE_TTL_DETAILS = 86400  # 24 hours; credits and external ids rarely change
+CACHE_TTL_GENRES = 86400   # 24 hours; genres are invalidated explicitly
+CACHE_TTL_GENRES_LOCAL = 60  # seconds genre maps stay memoized in-process
+
+# Process-local (L1) cache in front of the Redis entries, shared by
+# cached_get_json, get_popular and _fetch_omdb_data under their Redis
+# key names. Hot keys (popular lists, repeated searches, recurring OMDB
+# titles) become plain dict lookups instead of a Redis
+# round-trip plus decompress and JSON parse; the short TTL keeps the
+# extra staleness a worker can serve well inside every soft expiry
+# window. Access only happens between awaits on the event loop, so no
+# lock is needed.
+CACHE_TTL_L1 = 60
+_l1_cache: TTLCache = TTLCache(maxsize=1024, ttl=CACHE_TTL_L1)
+
+# In-process (L1) memo of the genre maps, keyed by is_series, holding
+# (monotonic timestamp, mapping) pairs; Redis stays the shared L2. The
+# lock collapses a stampede of concurrent memo misses into one lookup.
+_genre_cache: Dict[bool, Tuple[float, Dict[int, str]]] = {}
+_genre_lock = asyncio.Lock()
+
+# Sentinel stored in Redis for IMDB ids that OMDB has no data for,
+# so we don't re-query OMDB for them on every search.
+_OMDB_MISS = "null"
+
+# Bound concurrent outbound HTTP calls so a large result page fanned out
+# with asyncio.gather doesn't stampede the upstream APIs. OMDB's free
+# tier tolerates far less parallelism than TMDB, so it gets its own,
+# tighter gate plus a shorter per-call timeout.
+_tmdb_sem = asyncio.Semaphore(30)
+_omdb_sem = asyncio.Semaphore(10)
+OMDB_TIMEOUT = 5.0
+
+# In-flight upstream fetches keyed by cache key; concurrent misses for
+# the same key await the one fetch already running instead of piling
+# duplicate requests onto TMDB.
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _unwrap_swr(raw: bytes) -> Tuple[dict, bool]:
+    """
+    Unpack a cached stale-while-revalidate envelope.
+
+    :param raw: JSON envelope as stored in Redis.
+    :return: Tuple of (payload, True if still within its soft expiry).
+    """
+    entry = orjson.loads(raw)
+    return entry.get('data'), time.time() < entry.get('soft_expires', 0)
+
+
+async def _fetch_and_store(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict,
+    ttl: int,
+    key: str
+) -> dict:
+    """
+    Single-flight upstream fetch plus cache write: the miss path of
+    cached_get_json. Payloads are stored in a {data, soft_expires}
+    envelope whose Redis TTL is twice the soft one, leaving a stale
+    window to serve from while a refresh runs.
+
+    :param client: HTTP client for making API requests.
+    :param url: URL to fetch.
+    :param params: Query parameters for the request.
+    :param ttl: Soft cache expiry in seconds.
+    :param key: Redis key to cache the payload under.
+    :return: Parsed JSON payload.
+    """
+    pending = _inflight.get(key)
+    if pending is not None:
+        return await pending
+
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        async with _tmdb_sem:
+            resp = await client.get(url, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+    except BaseException as e:
+        fut.set_exception(e)
+        fut.exception()  # mark retrieved for waiters that already left
+        raise
+    else:
+        fut.set_result(data)
+    finally:
+        del _inflight[key]
+
+    _l1_cache[key] = data
+    try:
+        await _redis_raw.set(
+            f"z:{key}",
+            _compress(orjson.dumps(
+                {'data': data, 'soft_expires': time.time() + ttl})),
+            ex=ttl * 2
+        )
+    except (redis.RedisError, OSError):
+        pass
+    return data
+
+
+async def cached_get_json(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict,
+    ttl: int,
+    key: str
+) -> dict:
+    """
+    GET a JSON payload through a read-through Redis cache.
+    Fresh entries are returned directly. Entries past their soft expiry
+    are served immediately while a background task refreshes them
+    (stale-while-revalidate), so an expired hit costs a Redis GET
+    instead of a full upstream round-trip. Concurrent misses for the
+    same key are coalesced into a single upstream fetch (single-flight),
+    and if Redis is unavailable the call degrades to a plain fetch so
+    the cache layer never takes the search path down.
+
+    :param client: HTTP client for making API requests.
+    :param url: URL to fetch on a cache miss.
+    :param params: Query parameters for the request.
+    :param ttl: Soft cache expiry in seconds.
+    :param key: Redis key to cache the payload under.
+    :return: Parsed JSON payload.
+    """
+    local = _l1_cache.get(key)
+    if local is not None:
+        return local
+
+    try:
+        cached = await _redis_raw.get(f"z:{key}")
+    except (redis.RedisError, OSError):
+        cached = None
+    if cached is not None:
+        data, fresh = _unwrap_swr(_decompress(cached))
+        if fresh:
+            _l1_cache[key] = data
+        elif key not in _inflight:
+            task = asyncio.create_task(
+                _fetch_and_store(client, url, params, ttl, key))
+            # background refresh is best effort; don't let a failure warn
+            task.add_done_callback(lambda t: t.exception())
+        return data
+
+    return await _fetch_and_store(client, url, params, ttl, key)
 
 
 async def fetch_genres(
@@ -24,26 +193,90 @@ async def fetch_genres(
 ) -> Dict[int, str]:
     """
     Fetch and cache TMDB genres mapping for movies or TV series.
+    The mapping is memoized in-process for a short window on top of the
+    Redis entry, so the repeated lookups within and across requests cost
+    a dict access instead of a Redis round-trip and JSON parse.
 
     :param client: HTTP client for making API requests.
     :param is_series: Boolean indicating if genres are for TV series (True) or movies (False).
     :return: Dictionary mapping genre IDs to their names.
     """
-    endpoint = 'tv' if is_series else 'movie'
-    key = f"genres:{endpoint}"
-    cached = await _redis.get(key)
-    if cached:
-        return {int(k): v for k, v in json.loads(cached).items()}
+    entry = _genre_cache.get(is_series)
+    if entry and time.monotonic() - entry[0] < CACHE_TTL_GENRES_LOCAL:
+        return entry[1]
+
+    async with _genre_lock:
+        # a concurrent call may have filled the memo while we waited, in
+        # which case the whole Redis/TMDB round-trip is skipped
+        entry = _genre_cache.get(is_series)
+        if entry and time.monotonic() - entry[0] < CACHE_TTL_GENRES_LOCAL:
+            return entry[1]
+
+        endpoint = 'tv' if is_series else 'movie'
+        key = f"genres:{endpoint}"
+        cached = await _redis.get(key)
+        if cached:
+            mapping = {int(k): v for k, v in orjson.loads(cached).items()}
+            _genre_cache[is_series] = (time.monotonic(), mapping)
+            return mapping
+
+        resp = await client.get(
+            f"{BASE_URL}/genre/{endpoint}/list",
+            params={'api_key': TMDB_API_KEY}
+        )
+        resp.raise_for_status()
+        genres = resp.json().get('genres', [])
+        mapping = {g['id']: g['name'] for g in genres}
+        await _redis.set(
+            key,
+            orjson.dumps(mapping, option=orjson.OPT_NON_STR_KEYS),
+            ex=CACHE_TTL_GENRES
+        )
+        _genre_cache[is_series] = (time.monotonic(), mapping)
+        return mapping
 
-    resp = await client.get(
-        f"{BASE_URL}/genre/{endpoint}/list",
-        params={'api_key': TMDB_API_KEY}
-    )
-    resp.raise_for_status()
-    genres = resp.json().get('genres', [])
-    mapping = {g['id']: g['name'] for g in genres}
-    await _redis.set(key, json.dumps(mapping))
-    return mapping
+
+def invalidate_responses() -> None:
+    """
+    Drop the process-local response cache so the next reads go back to
+    Redis (and from there to the upstreams if those entries expired).
+    """
+    _l1_cache.clear()
+
+
+async def invalidate_genres() -> None:
+    """
+    Drop the cached genre maps, in-process and in Redis, forcing the next
+    fetch_genres call to reload them from TMDB.
+    """
+    _genre_cache.clear()
+    try:
+        await _redis.delete("genres:movie", "genres:tv")
+    except (redis.RedisError, OSError):
+        pass
+
+
+async def refresh_popular(client: httpx.AsyncClient) -> None:
+    """
+    Re-fetch the popular movie and TV lists from TMDB and overwrite the
+    cached copies, so users never pay the miss when the TTL window rolls
+    over. The TTL (doubled here) stays on as a safety net in case the
+    refresher stops running.
+
+    :param client: HTTP client for making API requests.
+    """
+    for endpoint in ('movie', 'tv'):
+        resp = await client.get(
+            f"{BASE_URL}/{endpoint}/popular",
+            params={'api_key': TMDB_API_KEY, 'page': 1}
+        )
+        resp.raise_for_status()
+        items = resp.json().get('results', [])
+        _l1_cache[f"popular:{endpoint}"] = items
+        await _redis_raw.set(
+            f"z:popular:{endpoint}", _compress(orjson.dumps(items)),
+            ex=CACHE_TTL_POPULAR * 2
+        )
 
 
 async def get_search_results(
@@ -60,12 +293,14 @@ async def get_search_results(
     :return: Tuple containing the list of search results and the endpoint used.
     """
     endpoint = 'tv' if is_series else 'movie'
-    resp = await client.get(
+    data = await cached_get_json(
+        client,
         f"{BASE_URL}/search/{endpoint}",
-        params={'api_key': TMDB_API_KEY, 'query': title, 'page': 1}
+        {'api_key': TMDB_API_KEY, 'query': title, 'page': 1},
+        CACHE_TTL_SEARCH,
+        f"tmdb:search:{endpoint}:{title.lower()}:1"
     )
-    resp.raise_for_status()
-    return resp.json().get('results', []), endpoint
+    return data.get('results', []), endpoint
 
 
 async def discover_by_filters(
@@ -89,6 +324,27 @@ async def discover_by_filters(
         return await _discover_movie_by_filters(client, genre, actors)
 
 
+async def _search_person(
+    client: httpx.AsyncClient,
+    actors: str
+) -> List[dict]:
+    """
+    Search TMDB for a person by name, with caching.
+
+    :param client: HTTP client for making API requests.
+    :param actors: Actor name to search for.
+    :return: List of matching people.
+    """
+    data = await cached_get_json(
+        client,
+        f"{BASE_URL}/search/person",
+        {'api_key': TMDB_API_KEY, 'query': actors, 'page': 1},
+        CACHE_TTL_SEARCH,
+        f"tmdb:person:{actors.lower()}:1"
+    )
+    return data.get('results', [])
+
+
 async def _discover_movie_by_filters(
     client: httpx.AsyncClient,
     genre: Optional[str],
@@ -114,18 +370,19 @@ async def _discover_movie_by_filters(
             query['with_genres'] = gid
 
     if actors:
-        p = await client.get(
-            f"{BASE_URL}/search/person",
-            params={'api_key': TMDB_API_KEY, 'query': actors, 'page': 1}
-        )
-        p.raise_for_status()
-        people = p.json().get('results', [])
+        people = await _search_person(client, actors)
         if people:
             query['with_cast'] = str(people[0].get('id'))
 
-    resp = await client.get(f"{BASE_URL}/discover/{endpoint}", params=query)
-    resp.raise_for_status()
-    return resp.json().get('results', []), endpoint
+    data = await cached_get_json(
+        client,
+        f"{BASE_URL}/discover/{endpoint}",
+        query,
+        CACHE_TTL_SEARCH,
+        f"tmdb:discover:{endpoint}:{query.get('with_genres', '-')}"
+        f":{query.get('with_cast', '-')}:1"
+    )
+    return data.get('results', []), endpoint
 
 
 async def _discover_tv_by_filters(
@@ -147,23 +404,20 @@ async def _discover_tv_by_filters(
 
     if actors:
         # Find the person ID
-        p = await client.get(
-            f"{BASE_URL}/search/person",
-            params={'api_key': TMDB_API_KEY, 'query': actors, 'page': 1}
-        )
-        p.raise_for_status()
-        people = p.json().get('results', [])
+        people = await _search_person(client, actors)
         if not people:
             return [], endpoint
 
         person_id = people[0].get('id')
         # Get TV credits for the person
-        credits_resp = await client.get(
+        credits_data = await cached_get_json(
+            client,
             f"{BASE_URL}/person/{person_id}/tv_credits",
-            params={'api_key': TMDB_API_KEY}
+            {'api_key': TMDB_API_KEY},
+            CACHE_TTL_DETAILS,
+            f"tmdb:tv_credits:{person_id}"
         )
-        credits_resp.raise_for_status()
-        credits = credits_resp.json().get('cast', [])
+        credits = credits_data.get('cast', [])
 
         if genre:
             # Filter credits by genre
@@ -189,9 +443,14 @@ async def _discover_tv_by_filters(
             if gid:
                 query['with_genres'] = gid
 
-        resp = await client.get(f"{BASE_URL}/discover/{endpoint}", params=query)
-        resp.raise_for_status()
-        return resp.json().get('results', []), endpoint
+        data = await cached_get_json(
+            client,
+            f"{BASE_URL}/discover/{endpoint}",
+            query,
+            CACHE_TTL_SEARCH,
+            f"tmdb:discover:{endpoint}:{query.get('with_genres', '-')}:-:1"
+        )
+        return data.get('results', []), endpoint
 
 
 async def get_popular(
@@ -200,6 +459,9 @@ async def get_popular(
 ) -> List[dict]:
     """
     Get popular movies or TV series from TMDB, with caching.
+    The no-filter search path hits this on every request, so the page is
+    served from the process-local L1 cache when possible, skipping the
+    Redis round-trip plus decompress and parse of a full TMDB page.
 
     :param client: HTTP client for making API requests.
     :param is_series: Boolean indicating if fetching popular TV series (True) or movies (False).
@@ -207,9 +469,15 @@ async def get_popular(
     """
     endpoint = 'tv' if is_series else 'movie'
     key = f"popular:{endpoint}"
-    cached = await _redis.get(key)
+    local = _l1_cache.get(key)
+    if local is not None:
+        return local
+
+    cached = await _redis_raw.get(f"z:{key}")
     if cached:
-        return json.loads(cached)
+        items = orjson.loads(_decompress(cached))
+        _l1_cache[key] = items
+        return items
 
     resp = await client.get(
         f"{BASE_URL}/{endpoint}/popular",
@@ -217,52 +485,87 @@ async def get_popular(
     )
     resp.raise_for_status()
     items = resp.json().get('results', [])
-    await _redis.set(key, json.dumps(items), ex=CACHE_TTL_POPULAR)
+    _l1_cache[key] = items
+    await _redis_raw.set(f"z:{key}", _compress(orjson.dumps(items)),
+                         ex=CACHE_TTL_POPULAR)
     return items
 
 
-async def _fetch_credits(
-    client: httpx.AsyncClient,
-    media_type: str,
-    tmdb_id: int
-) -> List[str]:
-    """
-    Fetch the cast (actors) for a movie or TV series from TMDB.
+def _details_key(media_type: str, tmdb_id: int) -> str:
+    """Redis key holding the combined details payload for one item."""
+    return f"tmdb:full:{media_type}:{tmdb_id}"
 
-    :param client: HTTP client for making API requests.
-    :param media_type: 'movie' or 'tv'.
-    :param tmdb_id: TMDB ID of the movie or TV series.
-    :return: List of actor names.
-    """
-    resp = await client.get(
-        f"{BASE_URL}/{media_type}/{tmdb_id}/credits",
-        params={'api_key': TMDB_API_KEY}
-    )
-    resp.raise_for_status()
-    cast = resp.json().get('cast', [])
-    return [c.get('name') for c in cast if c.get('name')]
 
+async def prefetch_cached_details(
+    items: List[Tuple[dict, str]]
+) -> Dict[str, dict]:
+    """
+    Batch-load the cached detail payloads for a page of results with a
+    single MGET instead of one Redis GET per item. Misses (and Redis
+    being unreachable) simply fall through to the per-item fetch path.
 
-async def _get_imdb_id(
+    :param items: List of (TMDB item, media_type) pairs.
+    :return: Dictionary mapping detail cache keys to cached payloads.
+    """
+    keys = [_details_key(t, item.get('id')) for item, t in items]
+    if not keys:
+        return {}
+    try:
+        values = await _redis_raw.mget([f"z:{k}" for k in keys])
+    except (redis.RedisError, OSError):
+        return {}
+    prefetched: Dict[str, dict] = {}
+    for k, v in zip(keys, values):
+        if not v:
+            continue
+        data, fresh = _unwrap_swr(_decompress(v))
+        # stale entries fall through to cached_get_json, which serves
+        # them while kicking off a background refresh
+        if fresh:
+            prefetched[k] = data
+    return prefetched
+
+
+async def _fetch_details(
     client: httpx.AsyncClient,
     media_type: str,
-    tmdb_id: int
-) -> Optional[str]:
+    tmdb_id: int,
+    prefetched: Optional[Dict[str, dict]] = None
+) -> Tuple[List[str], Optional[str]]:
     """
-    Get the IMDB ID for a movie or TV series from TMDB.
+    Fetch the cast and IMDB ID for a movie or TV series in a single TMDB
+    call via append_to_response, with caching. One request replaces the
+    separate /credits and details lookups.
 
     :param client: HTTP client for making API requests.
     :param media_type: 'movie' or 'tv'.
     :param tmdb_id: TMDB ID of the movie or TV series.
-    :return: IMDB ID if available, else None.
+    :param prefetched: Optional batch-loaded cache entries keyed by
+        _details_key, consulted before Redis.
+    :return: Tuple of (list of actor names, IMDB ID or None).
     """
-    resp = await client.get(
-        f"{BASE_URL}/{media_type}/{tmdb_id}",
-        params={'api_key': TMDB_API_KEY}
-    )
-    if resp.status_code == 200:
-        return resp.json().get('imdb_id')
-    return None
+    key = _details_key(media_type, tmdb_id)
+    if prefetched and key in prefetched:
+        data = prefetched[key]
+    else:
+        try:
+            data = await cached_get_json(
+                client,
+                f"{BASE_URL}/{media_type}/{tmdb_id}",
+                {'api_key': TMDB_API_KEY,
+                 'append_to_response': 'external_ids,credits'},
+                CACHE_TTL_DETAILS,
+                key
+            )
+        except httpx.HTTPStatusError:
+            return [], None
+
+    cast = data.get('credits', {}).get('cast', [])
+    actors = [c.get('name') for c in cast if c.get('name')]
+    # movies carry imdb_id at top level, TV shows only under external_ids
+    imdb_id = data.get('imdb_id') or data.get(
+        'external_ids', {}).get('imdb_id')
+    return actors, imdb_id
 
 
 async def _fetch_omdb_data(
@@ -270,19 +573,87 @@ async def _fetch_omdb_data(
     imdb_id: str
 ) -> Optional[dict]:
     """
-    Fetch movie or TV series data from OMDB using IMDB ID.
+    Fetch movie or TV series data from OMDB using IMDB ID, with caching.
+    Successful lookups are cached for CACHE_TTL_OMDB; IMDB ids unknown to
+    OMDB are cached as a miss for CACHE_TTL_OMDB_MISS so repeated searches
+    for the same titles don't keep hitting OMDB. Hot entries (the same
+    titles recurring across result pages) are additionally served from
+    the process-local L1 cache, sparing a Redis GET per result item;
+    the miss sentinel is memoized there too. Concurrent misses for the
+    same id (the same title surfacing several times in a gathered result
+    page) are coalesced into one OMDB call via the shared in-flight map,
+    matching what _fetch_and_store does for TMDB fetches.
 
     :param client: HTTP client for making API requests.
     :param imdb_id: IMDB ID of the movie or TV series.
     :return: Dictionary of OMDB data if successful, else None.
     """
-    resp = await client.get(
-        OMDB_BASE_URL, params={'apikey': OMDB_API_KEY, 'i': imdb_id}
-    )
-    data = resp.json()
-    if resp.status_code == 200 and data.get('Response') == 'True':
+    key = f"omdb:{imdb_id}"
+    local = _l1_cache.get(key)
+    if local is not None:
+        return None if local is _OMDB_MISS else local
+
+    cached = await _redis.get(key)
+    if cached is not None:
+        data = None if cached == _OMDB_MISS else orjson.loads(cached)
+        _l1_cache[key] = _OMDB_MISS if data is None else data
         return data
-    return None
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        return await pending
+
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        async with _omdb_sem:
+            resp = await client.get(
+                OMDB_BASE_URL,
+                params={'apikey': OMDB_API_KEY, 'i': imdb_id},
+                timeout=OMDB_TIMEOUT
+            )
+        data = resp.json()
+        if resp.status_code != 200 or data.get('Response') != 'True':
+            data = None
+    except BaseException as e:
+        fut.set_exception(e)
+        fut.exception()  # mark retrieved for waiters that already left
+        raise
+    else:
+        fut.set_result(data)
+    finally:
+        del _inflight[key]
+
+    _l1_cache[key] = data if data is not None else _OMDB_MISS
+    if data is not None:
+        await _redis.set(key, orjson.dumps(data), ex=CACHE_TTL_OMDB)
+    else:
+        await _redis.set(key, _OMDB_MISS, ex=CACHE_TTL_OMDB_MISS)
+    return data
+
+
+@dataclass(slots=True)
+class RawTmdbItem:
+    """
+    The handful of TMDB result fields map_to_movie actually reads,
+    pulled out of the raw dict once up front so the per-item mapping
+    uses slot attribute access instead of repeated dict lookups.
+    """
+    id: Optional[int]
+    title: str
+    date: str
+    genre_ids: List[int]
+    poster_path: Optional[str]
+
+    @classmethod
+    def from_dict(cls, item: dict) -> 'RawTmdbItem':
+        return cls(
+            id=item.get('id'),
+            title=item.get('title') or item.get('name') or '',
+            date=item.get('release_date') or item.get('first_air_date') or '',
+            genre_ids=item.get('genre_ids') or [],
+            poster_path=item.get('poster_path')
+        )
 
 
 async def map_to_movie(
@@ -290,7 +661,8 @@ async def map_to_movie(
     media_type: str,
     genres: Dict[int, str],
     params: MovieSearchParams,
-    client: httpx.AsyncClient
+    client: httpx.AsyncClient,
+    prefetched: Optional[Dict[str, dict]] = None
 ) -> MovieResponse:
     """
     Map TMDB item data to a MovieResponse object, enriching with OMDB data if available.
@@ -300,28 +672,52 @@ async def map_to_movie(
     :param genres: Dictionary mapping genre IDs to names.
     :param params: MovieSearchParams object for additional context.
     :param client: HTTP client for making API requests.
+    :param prefetched: Optional batch-loaded detail cache entries.
     :return: MovieResponse object.
     """
-    tmdb_id = item.get('id')
-    title = item.get('title') or item.get('name') or ''
-    date = item.get('release_date') or item.get('first_air_date') or ''
-    year = int(date.split('-')[0]) if date else None
-
-    genre_list = [genres.get(g)
-                  for g in item.get('genre_ids', []) if genres.get(g)]
-    actors = await _fetch_credits(client, media_type, tmdb_id)
+    raw = RawTmdbItem.from_dict(item)
+    tmdb_id = raw.id
+    title = raw.title
+    year = int(raw.date.split('-')[0]) if raw.date else None
+
+    # one lookup per genre id instead of two (the comprehension used to
+    # call genres.get both to filter and to collect)
+    genre_list = [name for name in map(genres.get, raw.genre_ids) if name]
+    actors, imdb_id = await _fetch_details(
+        client, media_type, tmdb_id, prefetched)
+    type_ = params.type or ('series' if media_type == 'tv' else 'movie')
+    poster = (
+        f"https://image.tmdb.org/t/p/w500{raw.poster_path}"
+        if raw.poster_path else None
+    )
 
-    imdb_id = await _get_imdb_id(client, media_type, tmdb_id)
-    omdb = await _fetch_omdb_data(client, imdb_id) if imdb_id else None
+    if not imdb_id:
+        # Fast path: a fair share of result items carry no IMDB id, and
+        # for those there is nothing to merge, so return before any of
+        # the OMDB plumbing below runs. model_construct skips the
+        # (redundant) Pydantic validation pass since every field is
+        # already normalized to the schema's types.
+        return MovieResponse.model_construct(
+            id=str(tmdb_id),
+            title=title or '',
+            year=year,
+            type=type_,
+            genres=genre_list,
+            actors=list(actors),
+            director=None,
+            runtime=None,
+            plot=None,
+            poster_url=poster,
+            ratings={},
+            source='TMDB'
+        )
 
+    omdb = await _fetch_omdb_data(client, imdb_id)
     if omdb:
         director = omdb.get('Director')
         runtime = omdb.get('Runtime')
         plot = omdb.get('Plot')
-        poster = (
-            f"https://image.tmdb.org/t/p/w500{item['poster_path']}"
-            if item.get('poster_path') else omdb.get('Poster')
-        )
+        poster = poster or omdb.get('Poster')
         ratings = {r['Source']: r['Value'] for r in omdb.get('Ratings', [])}
         source = 'Merged'
         title = title or omdb.get('Title')
@@ -330,20 +726,16 @@ async def map_to_movie(
         director = None
         runtime = None
         plot = None
-        poster = (
-            f"https://image.tmdb.org/t/p/w500{item['poster_path']}"
-            if item.get('poster_path') else None
-        )
         ratings = {}
         source = 'TMDB'
 
-    return MovieResponse(
-        id=imdb_id or str(tmdb_id),
-        title=title,
+    return MovieResponse.model_construct(
+        id=imdb_id,
+        title=title or '',
         year=year,
-        type=params.type or ('series' if media_type == 'tv' else 'movie'),
+        type=type_,
         genres=genre_list,
-        actors=actors,
+        actors=list(actors),
         director=director,
         runtime=runtime,
         plot=plot,
@@ -353,6 +745,36 @@ async def map_to_movie(
     )
 
 
+def matches_lowered(
+    movie: MovieResponse,
+    type_: Optional[str],
+    genre_lc: Optional[str],
+    actors_lc: Optional[str]
+) -> bool:
+    """
+    Check a movie against filter values the caller casefolded once, so
+    filtering a whole result page doesn't re-fold the same parameter
+    strings for every item.
+
+    :param movie: MovieResponse object to check.
+    :param type_: Optional 'movie'/'series' filter.
+    :param genre_lc: Optional casefolded genre name to match exactly.
+    :param actors_lc: Optional casefolded actor substring to match.
+    :return: True if the movie matches all criteria, else False.
+    """
+    if type_ and movie.type != type_:
+        return False
+    if genre_lc and not any(genre_lc == g.casefold() for g in movie.genres):
+        return False
+    if actors_lc:
+        # one casefold + one C-level substring scan over the joined cast
+        # instead of a fold and scan per actor; the newline separator
+        # keeps a query from matching across two adjacent names
+        if actors_lc not in "\n".join(movie.actors).casefold():
+            return False
+    return True
+
+
 def matches(
     movie: MovieResponse,
     params: MovieSearchParams
@@ -364,10 +786,9 @@ def matches(
     :param params: MovieSearchParams object containing search criteria.
     :return: True if the movie matches all criteria, else False.
     """
-    if params.type and movie.type != params.type:
-        return False
-    if params.genre and not any(g.lower() == params.genre.lower() for g in movie.genres):
-        return False
-    if params.actors and not any(params.actors.lower() in a.lower() for a in movie.actors):
-        return False
-    return True
+    return matches_lowered(
+        movie,
+        params.type,
+        params.genre.casefold() if params.genre else None,
+        params.actors.casefold() if params.actors else None
+    )
@@ -0,0 +1,55 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Callable, Dict
+
+import httpx
+import pytest
+import uvloop
+from fastapi.testclient import TestClient
+
+import app.main as main
+
+
+def pytest_asyncio_loop_factories(config, item):
+    # run the async tests on uvloop, same as production uvicorn workers
+    return {"uvloop": uvloop.new_event_loop}
+
+
+# One shared mock-backed HTTP client for the whole test session, instead
+# of every test defining its own throwaway Dummy/FakeResp classes. Tests
+# declare the responses they need through register_responses; any URL
+# not registered gets an empty 200 JSON body, which matches what the old
+# default dummies returned.
+_responses: ContextVar[Dict[str, httpx.Response]] = ContextVar(
+    "mock_responses", default={})
+
+
+def _router(request: httpx.Request) -> httpx.Response:
+    url = str(request.url.copy_with(query=None))
+    return _responses.get().get(url, httpx.Response(200, json={}))
+
+
+@pytest.fixture(scope="module")
+def api_client():
+    # One TestClient (and so one app lifespan and thread pool) per test
+    # module, instead of paying the Starlette startup cost in every
+    # endpoint test. Startup's cache warm-ups are best-effort and no-op
+    # without Redis/TMDB, so sharing the client is safe.
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def mock_transport_client():
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_router))
+    yield client
+    asyncio.run(client.aclose())
+
+
+@pytest.fixture
+def register_responses() -> Callable[[Dict[str, httpx.Response]], None]:
+    # Each async test runs in its own task, so values set here live in
+    # that task's context and vanish with it — no teardown needed.
+    def _register(responses: Dict[str, httpx.Response]) -> None:
+        _responses.set(responses)
+    return _register
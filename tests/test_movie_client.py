@@ -1,79 +1,87 @@
 import pytest
 import asyncio
+import httpx
 
 import app.clients.movie_client as mc
 import app.utils.utils_movies_client as uclient
 
-from fastapi.testclient import TestClient
 import app.main as main
 from app.schemas.movies_schemas import MovieSearchParams, MovieResponse
 
 
-@pytest.fixture
-def dummy_client():
-    class Dummy:
-        async def get(self, *args, **kwargs):
-            class FakeResp:
-                status_code = 200
-                def raise_for_status(self): pass
-                def json(self): return {}
-            return FakeResp()
-    return Dummy()
+# Default field values for test MovieResponse objects. _mk builds them
+# via model_construct, skipping Pydantic validation the tests don't
+# need, so each construction is a dict merge instead of a full
+# validation pass over every field.
+_DEFAULT = dict(
+    id="0", title="", year=0, type="movie", genres=[], actors=[],
+    director=None, runtime=None, plot=None, poster_url=None,
+    ratings={}, source="TMDB"
+)
+
+
+def _mk(**overrides) -> MovieResponse:
+    return MovieResponse.model_construct(**{**_DEFAULT, **overrides})
 
 
 @pytest.fixture
-def event_loop():
-    loop = asyncio.get_event_loop()
-    yield loop
-    loop.close()
-
-
-def test_matches_strict_type_and_genre_and_actors():
-    movie = MovieResponse(
-        id="1", title="Test Movie", year=2020,
-        type="movie", genres=["Action"],
-        actors=["Alice Smith", "Bob Jones"],
-        director=None, runtime=None,
-        plot=None, poster_url=None,
-        ratings={}, source="TMDB"
-    )
-    params = MovieSearchParams(
-        title=None, genre="Action", actors="Alice", type="movie"
-    )
-    assert uclient.matches(movie, params) is True
-
-
-def test_matches_fails_on_type_mismatch():
-    movie = MovieResponse(
-        id="2", title="Test", year=2021,
-        type="series", genres=["Drama"], actors=[],
-        director=None, runtime=None,
-        plot=None, poster_url=None,
-        ratings={}, source="TMDB"
-    )
-    params = MovieSearchParams(
-        title=None, genre=None, actors=None, type="movie"
-    )
-    assert uclient.matches(movie, params) is False
-
-
-@pytest.mark.asyncio
-async def test_get_search_results_returns_list_and_endpoint(dummy_client):
-    async def fake_get(*args, **kwargs):
-        class FakeResp:
-            status_code = 200
-            def raise_for_status(self): pass
-            def json(self): return {"results": [{"id": 123, "title": "Foo"}]}
-        return FakeResp()
-
-    dummy_client.get = fake_get
-    results, endpoint = await uclient.get_search_results(dummy_client, "Foo", is_series=False)
+def mc_stubs(monkeypatch):
+    """
+    One dispatching fake per movie_client collaborator, installed once.
+    Tests assign the entries they need (e.g.
+    mc_stubs["fetch_genres"] = fake) instead of monkeypatching each
+    module global themselves. The per-item mapper is not patched here:
+    the _search_* helpers take it as a mapper= parameter, so tests
+    inject their fakes directly.
+    """
+    stubs = {}
+    for name in ("get_search_results", "fetch_genres",
+                 "discover_by_filters", "get_popular"):
+        async def _dispatch(*args, _name=name, **kwargs):
+            return await stubs[_name](*args, **kwargs)
+        monkeypatch.setattr(mc, name, _dispatch)
+    return stubs
+
+
+@pytest.mark.parametrize("movie,params,ok", [
+    # type + genre + actor substring all match
+    ({"genres": ["Action"], "actors": ["Alice Smith", "Bob Jones"]},
+     {"genre": "Action", "actors": "Alice", "type": "movie"}, True),
+    # type mismatch fails regardless of other fields
+    ({"type": "series", "genres": ["Drama"]}, {"type": "movie"}, False),
+    # genre not among the movie's genres
+    ({"genres": ["Drama"]}, {"genre": "Action"}, False),
+    # genre comparison is case-insensitive
+    ({"genres": ["Action"]}, {"genre": "action"}, True),
+    # actor filter is a case-insensitive substring match
+    ({"actors": ["Alice Smith"]}, {"actors": "alice"}, True),
+    # actor absent from the cast
+    ({"actors": ["Bob Jones"]}, {"actors": "Alice"}, False),
+    # matching uses casefold, so ß and ss compare equal
+    ({"actors": ["Anna Straße"]}, {"actors": "strasse"}, True),
+    # a query must not match across two adjacent cast names
+    ({"actors": ["Mia Moore", "Liam Law"]}, {"actors": "moore liam"}, False),
+    # no filters at all matches everything
+    ({}, {}, True),
+])
+def test_matches(movie, params, ok):
+    assert uclient.matches(
+        _mk(**movie), MovieSearchParams(**params)) is ok
+
+
+async def test_get_search_results_returns_list_and_endpoint(
+        mock_transport_client, register_responses):
+    register_responses({
+        f"{uclient.BASE_URL}/search/movie": httpx.Response(
+            200, json={"results": [{"id": 123, "title": "Foo"}]})
+    })
+    results, endpoint = await uclient.get_search_results(
+        mock_transport_client, "Foo", is_series=False)
     assert endpoint == "movie"
     assert results[0]["title"] == "Foo"
 
 
-@pytest.mark.asyncio
-async def test_search_by_title_only_calls_map_to_movie(monkeypatch, dummy_client):
+async def test_search_by_title_only_calls_map_to_movie(mc_stubs, mock_transport_client):
     params = MovieSearchParams(
         title="Bar", genre=None, actors=None, type="movie")
     # now restrict to movie only:
@@ -86,27 +94,22 @@ async def test_search_by_title_only_calls_map_to_movie(monkeypatch, dummy_client
     async def fake_fetch_genres(client, is_series):
         return {1: "Action"}
 
-    async def fake_map_to_movie(item, endpoint, genres, params, client):
-        return MovieResponse(
-            id="1", title="Bar", year=2020,
-            type="movie", genres=["Action"], actors=[],
-            director=None, runtime=None, plot=None,
-            poster_url=None, ratings={}, source="TMDB"
-        )
+    async def fake_map_to_movie(item, endpoint, genres, params, client, prefetched=None):
+        return _mk(id="1", title="Bar", year=2020, genres=["Action"])
 
-    monkeypatch.setattr(mc, "get_search_results", fake_get_search_results)
-    monkeypatch.setattr(mc, "fetch_genres",        fake_fetch_genres)
-    monkeypatch.setattr(mc, "map_to_movie",        fake_map_to_movie)
+    mc_stubs["get_search_results"] = fake_get_search_results
+    mc_stubs["fetch_genres"] = fake_fetch_genres
 
-    movies = await mc._search_by_title_only(dummy_client, params, is_series=False)
+    movies = await mc._search_by_title_only(
+        mock_transport_client, params, is_series=False,
+        mapper=fake_map_to_movie)
     assert len(movies) == 1
     assert movies[0].title == "Bar"
 
 # --- Unit tests for title + filters branch ------------------------------
 
 
-@pytest.mark.asyncio
-async def test_search_by_title_with_filters_filters_out_nonmatching(monkeypatch, dummy_client):
+async def test_search_by_title_with_filters_filters_out_nonmatching(mc_stubs, mock_transport_client):
     params = MovieSearchParams(
         title="Baz", genre="Comedy", actors="Alice", type="movie")
 
@@ -116,8 +119,9 @@ async def test_search_by_title_with_filters_filters_out_nonmatching(monkeypatch,
         # imagine two results, one matching Alice, one not
         return (
             [
-                {"id": 1, "title": "BazA"},  # will map to actor "Alice"
-                {"id": 2, "title": "BazB"},  # no Alice
+                # both carry the Comedy genre id; the actor filter decides
+                {"id": 1, "title": "BazA", "genre_ids": [1]},  # has "Alice"
+                {"id": 2, "title": "BazB", "genre_ids": [1]},  # no Alice
             ],
             "movie"
         )
@@ -125,34 +129,138 @@ async def test_search_by_title_with_filters_filters_out_nonmatching(monkeypatch,
     async def fake_fetch_genres(client, is_series):
         return {1: "Comedy"}
 
-    async def fake_map_to_movie(item, endpoint, genres, params, client):
+    async def fake_map_to_movie(item, endpoint, genres, params, client, prefetched=None):
         # for id==1 include Alice, for id==2 include Bob
         actors = ["Alice Smith"] if item["id"] == 1 else ["Bob Jones"]
-        return MovieResponse(
-            id=str(item["id"]),
-            title=item["title"],
-            year=2000,
-            type="movie",
-            genres=["Comedy"],
-            actors=actors,
-            director=None, runtime=None, plot=None,
-            poster_url=None, ratings={}, source="TMDB"
+        return _mk(
+            id=str(item["id"]), title=item["title"], year=2000,
+            genres=["Comedy"], actors=actors
         )
 
-    monkeypatch.setattr(mc, "get_search_results", fake_get_search_results)
-    monkeypatch.setattr(mc, "fetch_genres", fake_fetch_genres)
-    monkeypatch.setattr(mc, "map_to_movie", fake_map_to_movie)
+    mc_stubs["get_search_results"] = fake_get_search_results
+    mc_stubs["fetch_genres"] = fake_fetch_genres
 
-    movies = await mc._search_by_title_with_filters(dummy_client, params, is_series=False)
+    movies = await mc._search_by_title_with_filters(
+        mock_transport_client, params, is_series=False,
+        mapper=fake_map_to_movie)
     # only the first item should survive matches()
     assert len(movies) == 1
     assert movies[0].id == "1"
 
 
+async def test_search_by_title_with_filters_prefilters_on_genre_ids(mc_stubs, mock_transport_client):
+    """
+    Items whose genre_ids can't match the genre filter must be dropped
+    before map_to_movie runs, so they never cost enrichment calls.
+    """
+    params = MovieSearchParams(
+        title="Baz", genre="Comedy", actors=None, type="movie")
+
+    async def fake_get_search_results(client, title, is_series):
+        return (
+            [
+                {"id": 1, "title": "BazA", "genre_ids": [1]},   # Comedy
+                {"id": 2, "title": "BazB", "genre_ids": [99]},  # not Comedy
+            ],
+            "movie"
+        )
+
+    async def fake_fetch_genres(client, is_series):
+        return {1: "Comedy"}
+
+    mapped_ids = []
+
+    async def fake_map_to_movie(item, endpoint, genres, params, client, prefetched=None):
+        mapped_ids.append(item["id"])
+        return _mk(
+            id=str(item["id"]), title=item["title"], year=2000,
+            genres=["Comedy"]
+        )
+
+    mc_stubs["get_search_results"] = fake_get_search_results
+    mc_stubs["fetch_genres"] = fake_fetch_genres
+
+    movies = await mc._search_by_title_with_filters(
+        mock_transport_client, params, is_series=False,
+        mapper=fake_map_to_movie)
+    assert mapped_ids == [1]
+    assert len(movies) == 1
+
+
+async def test_search_by_title_with_filters_maps_items_concurrently(
+        mc_stubs, mock_transport_client):
+    import time
+
+    params = MovieSearchParams(
+        title="Baz", genre=None, actors="Alice", type="movie")
+
+    async def fake_get_search_results(client, title, is_series):
+        return ([{"id": i, "title": f"Baz{i}"} for i in range(4)], "movie")
+
+    async def fake_fetch_genres(client, is_series):
+        return {}
+
+    async def fake_map_to_movie(item, endpoint, genres, params, client, prefetched=None):
+        await asyncio.sleep(0.05)
+        return _mk(
+            id=str(item["id"]), title=item["title"], year=2000,
+            actors=["Alice Smith"]
+        )
+
+    mc_stubs["get_search_results"] = fake_get_search_results
+    mc_stubs["fetch_genres"] = fake_fetch_genres
+
+    start = time.perf_counter()
+    movies = await mc._search_by_title_with_filters(
+        mock_transport_client, params, is_series=False,
+        mapper=fake_map_to_movie)
+    elapsed = time.perf_counter() - start
+    assert len(movies) == 4
+    # four 0.05s mappings must overlap; serial execution would take 0.2s
+    assert elapsed < 0.15
+
+
+async def test_search_by_title_with_filters_scales_to_500_items(
+        mc_stubs, mock_transport_client):
+    """
+    Load-shaped check: a 500-item result page with a slow per-item
+    mapper must complete in roughly one mapping's latency, not 500.
+    A regression to serial awaits would take 5s and trip the bound.
+    """
+    import time
+
+    params = MovieSearchParams(
+        title="Baz", genre=None, actors="Alice", type="movie")
+    items = [{"id": i, "title": f"Baz{i}"} for i in range(500)]
+
+    async def fake_get_search_results(client, title, is_series):
+        return (items, "movie")
+
+    async def fake_fetch_genres(client, is_series):
+        return {}
+
+    async def slow_map(item, endpoint, genres, params, client, prefetched=None):
+        await asyncio.sleep(0.01)
+        return _mk(
+            id=str(item["id"]), title=item["title"], year=2000,
+            actors=["Alice Smith"]
+        )
+
+    mc_stubs["get_search_results"] = fake_get_search_results
+    mc_stubs["fetch_genres"] = fake_fetch_genres
+
+    start = time.perf_counter()
+    movies = await mc._search_by_title_with_filters(
+        mock_transport_client, params, is_series=False, mapper=slow_map)
+    elapsed = time.perf_counter() - start
+    assert len(movies) == 500
+    # generous bound for slow CI hosts, still far below the 5s serial case
+    assert elapsed < 1.0
+
+
 # --- Unit tests for filters-only branch ----------------------------------
 
-@pytest.mark.asyncio
-async def test_search_by_filters_only_uses_discover_and_filters(monkeypatch, dummy_client):
+async def test_search_by_filters_only_uses_discover_and_filters(mc_stubs, mock_transport_client):
     params = MovieSearchParams(
         title=None, genre="Drama", actors=None, type="series")
 
@@ -169,27 +277,25 @@ async def test_search_by_filters_only_uses_discover_and_filters(monkeypatch, dum
     async def fake_fetch_genres(client, is_series):
         return {5: "Drama", 1: "Comedy"}
 
-    async def fake_map_to_movie(item, endpoint, genres, params, client):
-        return MovieResponse(
-            id=str(item["id"]), title="X", year=2001,
-            type="series", genres=[genres[g] for g in item["genre_ids"]],
-            actors=[], director=None, runtime=None, plot=None,
-            poster_url=None, ratings={}, source="TMDB"
+    async def fake_map_to_movie(item, endpoint, genres, params, client, prefetched=None):
+        return _mk(
+            id=str(item["id"]), title="X", year=2001, type="series",
+            genres=[genres[g] for g in item["genre_ids"]]
         )
 
-    monkeypatch.setattr(mc, "discover_by_filters", fake_discover_by_filters)
-    monkeypatch.setattr(mc, "fetch_genres",         fake_fetch_genres)
-    monkeypatch.setattr(mc, "map_to_movie",         fake_map_to_movie)
+    mc_stubs["discover_by_filters"] = fake_discover_by_filters
+    mc_stubs["fetch_genres"] = fake_fetch_genres
 
-    shows = await mc._search_by_filters_only(dummy_client, params, is_series=True)
+    shows = await mc._search_by_filters_only(
+        mock_transport_client, params, is_series=True,
+        mapper=fake_map_to_movie)
     assert len(shows) == 1
     assert shows[0].genres == ["Drama"]
 
 
 # --- Unit tests for popular-fallback branch ------------------------------
 
-@pytest.mark.asyncio
-async def test_get_popular_fallback_combines_movies_and_tv(monkeypatch, dummy_client):
+async def test_get_popular_fallback_combines_movies_and_tv(mc_stubs, mock_transport_client):
     params = MovieSearchParams(title=None, genre=None, actors=None, type=None)
 
     async def fake_get_popular(client, is_series):
@@ -199,52 +305,59 @@ async def test_get_popular_fallback_combines_movies_and_tv(monkeypatch, dummy_cl
     async def fake_fetch_genres(client, is_series):
         return {}
 
-    async def fake_map_to_movie(item, t, genres, params, client):
-        return MovieResponse(
+    async def fake_map_to_movie(item, t, genres, params, client, prefetched=None):
+        return _mk(
             id=str(item["id"]), title=f"Title{item['id']}",
-            year=1990, type=("series" if t == "tv" else "movie"),
-            genres=[], actors=[], director=None, runtime=None,
-            plot=None, poster_url=None, ratings={}, source="TMDB"
+            year=1990, type=("series" if t == "tv" else "movie")
         )
 
-    monkeypatch.setattr(mc, "get_popular",     fake_get_popular)
-    monkeypatch.setattr(mc, "fetch_genres",    fake_fetch_genres)
-    monkeypatch.setattr(mc, "map_to_movie",    fake_map_to_movie)
+    mc_stubs["get_popular"] = fake_get_popular
+    mc_stubs["fetch_genres"] = fake_fetch_genres
 
-    top = await mc._get_popular_fallback(dummy_client, params)
+    top = await mc._get_popular_fallback(
+        mock_transport_client, params, mapper=fake_map_to_movie)
     # when no title, result list is sorted alphabetically by title:
     assert [m.title for m in top] == ["Title100", "Title200"]
 
 
+async def test_get_popular_fallback_fetches_concurrently(
+        mc_stubs, mock_transport_client):
+    params = MovieSearchParams(title=None, genre=None, actors=None, type=None)
+
+    started = []
+    seen_at_finish = []
+
+    async def fake_get_popular(client, is_series):
+        started.append(is_series)
+        await asyncio.sleep(0.01)
+        # record how many fetches had started by the time this one ends
+        seen_at_finish.append(len(started))
+        return []
+
+    async def fake_fetch_genres(client, is_series):
+        return {}
+
+    mc_stubs["get_popular"] = fake_get_popular
+    mc_stubs["fetch_genres"] = fake_fetch_genres
+
+    top = await mc._get_popular_fallback(mock_transport_client, params)
+    assert top == []
+    # both popular fetches must have started before either completed,
+    # i.e. they run under one asyncio.gather rather than serially
+    assert seen_at_finish == [2, 2]
+
+
 # --- Integration test against FastAPI endpoint --------------------------
 
-@pytest.fixture
-def client(monkeypatch):
-    # stub out the `search_tmdb` in tripklik.main
-    async def fake_search_tmdb(params):
+def test_search_movies_endpoint(api_client, monkeypatch):
+    # stub out the `search_tmdb` in main
+    async def fake_search_tmdb(params, client):
         return [
-            MovieResponse(
-                id="42",
-                title="Life of Pi",
-                year=2012,
-                type="movie",
-                genres=["Adventure"],
-                actors=[],
-                director=None,
-                runtime=None,
-                plot=None,
-                poster_url=None,
-                ratings={},
-                source="TMDB"
-            )
+            _mk(id="42", title="Life of Pi", year=2012, genres=["Adventure"])
         ]
-
     monkeypatch.setattr(main, "search_tmdb", fake_search_tmdb)
-    return TestClient(main.app)
-
 
-def test_search_movies_endpoint(client):
-    resp = client.get("/movies/search", params={"title": "whatever"})
+    resp = api_client.get("/movies/search", params={"title": "whatever"})
     assert resp.status_code == 200
 
     data = resp.json()
@@ -268,8 +381,7 @@ def test_search_movies_endpoint(client):
 # --- More unit‐tests for movie_client logic ------------------------------
 
 
-@pytest.mark.asyncio
-async def test_search_by_title_with_filters_for_series_uses_discover(monkeypatch, dummy_client):
+async def test_search_by_title_with_filters_for_series_uses_discover(mc_stubs, mock_transport_client):
     """
     When params.type='series' and params.actors is provided,
     _search_by_title_with_filters must call discover_by_filters(),
@@ -292,32 +404,25 @@ async def test_search_by_title_with_filters_for_series_uses_discover(monkeypatch
     async def fake_fetch_genres(client, is_series):
         return {9: "Sci‑Fi"}
 
-    async def fake_map(item, endpoint, genres, params_in, client):
+    async def fake_map(item, endpoint, genres, params_in, client, prefetched=None):
         # id=11 gets Jane, id=22 gets Bob
         actor_list = ["Jane Doe"] if item["id"] == 11 else ["Bob Smith"]
-        return MovieResponse(
-            id=str(item["id"]),
-            title=f"Show{item['id']}",
-            year=2021,
-            type="series",
-            genres=["Sci‑Fi"],
-            actors=actor_list,
-            director=None, runtime=None, plot=None,
-            poster_url=None, ratings={}, source="TMDB"
+        return _mk(
+            id=str(item["id"]), title=f"Show{item['id']}", year=2021,
+            type="series", genres=["Sci‑Fi"], actors=actor_list
         )
 
-    monkeypatch.setattr(mc, "discover_by_filters", fake_discover)
-    monkeypatch.setattr(mc, "fetch_genres",          fake_fetch_genres)
-    monkeypatch.setattr(mc, "map_to_movie",          fake_map)
+    mc_stubs["discover_by_filters"] = fake_discover
+    mc_stubs["fetch_genres"] = fake_fetch_genres
 
-    out = await mc._search_by_title_with_filters(dummy_client, params, is_series=True)
+    out = await mc._search_by_title_with_filters(
+        mock_transport_client, params, is_series=True, mapper=fake_map)
     # only the item with Jane should survive matches()
     assert len(out) == 1
     assert out[0].id == "11"
 
 
-@pytest.mark.asyncio
-async def test_search_by_filters_only_for_movie(monkeypatch, dummy_client):
+async def test_search_by_filters_only_for_movie(mc_stubs, mock_transport_client):
     """
     When there is no title but there are filters, _search_by_filters_only
     must call discover_by_filters() once.
@@ -331,29 +436,21 @@ async def test_search_by_filters_only_for_movie(monkeypatch, dummy_client):
     async def fake_fetch_genres(client, is_series):
         return {7: "Horror"}
 
-    async def fake_map(item, endpoint, genres, params_in, client):
-        return MovieResponse(
-            id=str(item["id"]),
-            title="Spooky",
-            year=1980,
-            type="movie",
-            genres=["Horror"],
-            actors=[],
-            director=None, runtime=None, plot=None,
-            poster_url=None, ratings={}, source="TMDB"
+    async def fake_map(item, endpoint, genres, params_in, client, prefetched=None):
+        return _mk(
+            id=str(item["id"]), title="Spooky", year=1980, genres=["Horror"]
         )
 
-    monkeypatch.setattr(mc, "discover_by_filters", fake_discover)
-    monkeypatch.setattr(mc, "fetch_genres",          fake_fetch_genres)
-    monkeypatch.setattr(mc, "map_to_movie",          fake_map)
+    mc_stubs["discover_by_filters"] = fake_discover
+    mc_stubs["fetch_genres"] = fake_fetch_genres
 
-    out = await mc._search_by_filters_only(dummy_client, params, is_series=False)
+    out = await mc._search_by_filters_only(
+        mock_transport_client, params, is_series=False, mapper=fake_map)
     assert len(out) == 1
     assert out[0].title == "Spooky"
 
 
-@pytest.mark.asyncio
-async def test_search_tmdb_with_title_but_no_type_uses_title_only_branch(monkeypatch, dummy_client):
+async def test_search_tmdb_with_title_but_no_type_uses_title_only_branch(monkeypatch, mock_transport_client):
     """
     If the user supplies only a title (type=None), search_tmdb()
     should still call _search_by_title_only under the hood.
@@ -377,35 +474,76 @@ async def test_search_tmdb_with_title_but_no_type_uses_title_only_branch(monkeyp
     monkeypatch.setattr(mc, "_get_popular_fallback", lambda *a,
                         **k: (_ for _ in ()).throw(AssertionError("wrong branch")))
 
-    await mc.search_tmdb(params)
+    await mc.search_tmdb(params, mock_transport_client)
     assert called.get('branch') == '_search_by_title_only'
 
+async def test_create_http_client_sets_timeouts():
+    client = main.create_http_client()
+    try:
+        # fail fast on dead upstreams, keep the full budget for slow ones
+        assert client.timeout.connect == 5.0
+        assert client.timeout.read == 10.0
+    finally:
+        await client.aclose()
+
+
 # --- Error‐handling and validation integration tests ----------------------
 
 
-def test_search_endpoint_invalid_type_param_returns_422():
+def test_search_endpoint_invalid_type_param_returns_422(api_client):
     """
     Pydantic should reject any type not in ('movie','series').
     """
-    client = TestClient(main.app)
-    resp = client.get("/movies/search", params={"type": "not-a-type"})
+    resp = api_client.get("/movies/search", params={"type": "not-a-type"})
     assert resp.status_code == 422
     # response JSON has 'detail' explaining the validation error
     assert any(err["loc"] == ["query", "type"]
                for err in resp.json()["detail"])
 
 
-def test_search_endpoint_third_party_error_is_502(monkeypatch):
+def test_search_endpoint_upstream_timeout_is_503(api_client, monkeypatch):
+    """
+    Upstream timeouts are surfaced as 503 rather than the generic 502.
+    """
+    async def too_slow(params, client):
+        raise httpx.ConnectTimeout("connection timed out")
+    monkeypatch.setattr(main, "search_tmdb", too_slow)
+
+    resp = api_client.get("/movies/search", params={})
+    assert resp.status_code == 503
+    assert "timed out" in resp.json()["detail"]
+
+
+def test_admin_cache_invalidate_genres(api_client, monkeypatch):
+    called = {}
+
+    async def fake_invalidate():
+        called['genres'] = True
+    monkeypatch.setattr(main, "invalidate_genres", fake_invalidate)
+
+    resp = api_client.post(
+        "/admin/cache/invalidate", params={"scope": "genres"})
+    assert resp.status_code == 200
+    assert resp.json() == {"invalidated": "genres"}
+    assert called.get('genres') is True
+
+
+def test_admin_cache_invalidate_unknown_scope_is_400(api_client):
+    resp = api_client.post(
+        "/admin/cache/invalidate", params={"scope": "bogus"})
+    assert resp.status_code == 400
+
+
+def test_search_endpoint_third_party_error_is_502(api_client, monkeypatch):
     """
     If search_tmdb raises, the endpoint should return 502 with our ErrorResponse.
     """
-    async def boom(params):
+    async def boom(params, client):
         raise RuntimeError("TMDB is down")
     # patch the name that main actually calls
     monkeypatch.setattr(main, "search_tmdb", boom)
 
-    client = TestClient(main.app)
-    resp = client.get("/movies/search", params={})
+    resp = api_client.get("/movies/search", params={})
     assert resp.status_code == 502
     body = resp.json()
     assert "TMDB service error" in body["detail"]
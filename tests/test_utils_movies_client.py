@@ -1,5 +1,6 @@
 import pytest
 import json
+import httpx
 from app.utils.utils_movies_client import (
     fetch_genres,
     _discover_movie_by_filters,
@@ -8,106 +9,362 @@ from app.utils.utils_movies_client import (
     get_search_results,
 )
 from app.schemas.movies_schemas import MovieSearchParams
-from httpx import HTTPStatusError, Response
+from httpx import HTTPStatusError
+
+
+class _FakeRedis:
+    """
+    Minimal async Redis stand-in shared by all tests here, replacing the
+    per-test FakeRedis class definitions. It serves gets from a seed
+    dict, counts them, records writes, and can be marked read-only for
+    cache-hit tests that must not write.
+    """
+
+    def __init__(self, store=None, readonly=False):
+        self.store = dict(store or {})
+        self.written = {}
+        self.gets = 0
+        self.mgets = 0
+        self.readonly = readonly
+
+    async def get(self, key):
+        self.gets += 1
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        self.mgets += 1
+        return [self.store.get(k) for k in keys]
+
+    async def set(self, key, value, ex=None):
+        if self.readonly:
+            raise AssertionError("set should not be called on cache hit")
+        self.written[key] = (value, ex)
+        self.store[key] = value
 
 
-class DummyClient:
-    def __init__(self, responses):
-        # responses: dict of url to FakeResp
-        self.responses = responses
+# --- fetch_genres tests ---
 
-    async def get(self, url, params=None):
-        return self.responses.get(url)
 
+@pytest.fixture(autouse=True)
+def clear_local_caches():
+    # keep the in-process genre memo and L1 response cache from leaking
+    # between tests
+    from app.utils import utils_movies_client as uclient
+    uclient._genre_cache.clear()
+    uclient._l1_cache.clear()
+    yield
+    uclient._genre_cache.clear()
+    uclient._l1_cache.clear()
 
-@pytest.fixture
-def dummy_client():
-    # a basic dummy_client that returns empty JSON 200
-    class Dummy:
-        async def get(self, *args, **kwargs):
-            class FakeResp:
-                status_code = 200
-                def raise_for_status(self): pass
-                def json(self): return {}
-            return FakeResp()
-    return Dummy()
 
+async def test_fetch_genres_cache_hit(monkeypatch, mock_transport_client):
+    # simulate redis cache hit
+    from app.utils import utils_movies_client as uclient
 
-# --- fetch_genres tests ---
+    cached = json.dumps({"10": "Horror", "20": "Comedy"})
+    monkeypatch.setattr(
+        uclient, "_redis",
+        _FakeRedis({"genres:movie": cached}, readonly=True))
 
+    # no response registered, so any TMDB call would come back empty
+    genres = await fetch_genres(mock_transport_client, is_series=False)
+    assert genres == {10: "Horror", 20: "Comedy"}
 
-@pytest.mark.asyncio
-async def test_fetch_genres_cache_hit(monkeypatch):
-    # simulate redis cache hit
+
+async def test_fetch_genres_cache_miss(
+        monkeypatch, mock_transport_client, register_responses):
     from app.utils import utils_movies_client as uclient
+    # simulate cache miss
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(uclient, "_redis", fake_redis)
 
-    cached = json.dumps({"10": "Horror", "20": "Comedy"})
+    # fake TMDB response
+    register_responses({
+        f"{uclient.BASE_URL}/genre/movie/list": httpx.Response(
+            200, json={"genres": [{"id": 1, "name": "Action"}]})
+    })
+    genres = await fetch_genres(mock_transport_client, is_series=False)
+    assert genres == {1: "Action"}
+    # the mapping must have been written back to Redis (keys as strings)
+    value, _ = fake_redis.written["genres:movie"]
+    assert json.loads(value) == {"1": "Action"}
 
-    class FakeRedis:
-        async def get(self, key):
-            return cached
 
-        async def set(self, key, value, ex=None):
-            raise AssertionError("set should not be called on cache hit")
-    monkeypatch.setattr(uclient, "_redis", FakeRedis())
+async def test_fetch_genres_in_process_memo(monkeypatch, mock_transport_client):
+    from app.utils import utils_movies_client as uclient
 
-    # client.get should not be called
-    dummy = DummyClient({})
-    genres = await fetch_genres(dummy, is_series=False)
-    assert genres == {10: "Horror", 20: "Comedy"}
+    fake_redis = _FakeRedis({"genres:movie": json.dumps({"1": "Action"})})
+    monkeypatch.setattr(uclient, "_redis", fake_redis)
 
+    first = await fetch_genres(mock_transport_client, is_series=False)
+    second = await fetch_genres(mock_transport_client, is_series=False)
+    assert first == second == {1: "Action"}
+    # second call must be served from the in-process memo
+    assert fake_redis.gets == 1
 
-@pytest.mark.asyncio
-async def test_fetch_genres_cache_miss(monkeypatch):
+
+async def test_fetch_genres_in_process_cache_dedup(
+        monkeypatch, mock_transport_client):
+    import asyncio
     from app.utils import utils_movies_client as uclient
-    # simulate cache miss
 
-    class FakeRedis:
-        async def get(self, key):
-            return None
+    fake_redis = _FakeRedis({"genres:movie": json.dumps({"1": "Action"})})
+    monkeypatch.setattr(uclient, "_redis", fake_redis)
 
-        async def set(self, key, value, ex=None):
-            # record the mapping written
-            # OM keys are strings
-            assert json.loads(value) == {"1": "Action"}
-    monkeypatch.setattr(uclient, "_redis", FakeRedis())
+    results = await asyncio.gather(*[
+        fetch_genres(mock_transport_client, is_series=False)
+        for _ in range(50)
+    ])
+    assert all(r == {1: "Action"} for r in results)
+    # concurrent memo misses collapse into a single Redis lookup
+    assert fake_redis.gets == 1
 
-    # fake TMDB response
-    class FakeResp:
-        status_code = 200
-        def raise_for_status(self): pass
-        def json(self): return {"genres": [{"id": 1, "name": "Action"}]}
-    # patch client.get
-    dummy = DummyClient({f"{uclient.BASE_URL}/genre/movie/list": FakeResp()})
-    genres = await fetch_genres(dummy, is_series=False)
-    assert genres == {1: "Action"}
 
-# --- error propagation ---
+# --- cached_get_json tests ---
+
+
+async def test_cached_get_json_hit_and_miss(
+        monkeypatch, mock_transport_client, register_responses):
+    import time
+    from app.utils import utils_movies_client as uclient
+
+    fake_redis = _FakeRedis({"z:some:key": uclient._compress(json.dumps(
+        {"data": {"results": [{"id": 1}]},
+         "soft_expires": time.time() + 60}).encode())})
+    monkeypatch.setattr(uclient, "_redis_raw", fake_redis)
+
+    # fresh cache hit: no upstream call is made
+    data = await uclient.cached_get_json(
+        mock_transport_client, "http://unused", {}, 60, "some:key")
+    assert data == {"results": [{"id": 1}]}
+
+    # cache miss: fetches and stores an envelope with a doubled hard TTL
+    register_responses({
+        "http://origin": httpx.Response(200, json={"results": [{"id": 2}]})
+    })
+    data = await uclient.cached_get_json(
+        mock_transport_client, "http://origin", {}, 60, "other:key")
+    assert data == {"results": [{"id": 2}]}
+    value, hard_ttl = fake_redis.written["z:other:key"]
+    envelope = json.loads(uclient._decompress(value))
+    assert envelope["data"] == {"results": [{"id": 2}]}
+    assert envelope["soft_expires"] > time.time()
+    assert hard_ttl == 120
+
+
+async def test_cached_get_json_l1_short_circuits_redis(
+        monkeypatch, mock_transport_client):
+    import time
+    from app.utils import utils_movies_client as uclient
+
+    fake_redis = _FakeRedis({"z:hot:key": uclient._compress(json.dumps(
+        {"data": {"results": ["hot"]},
+         "soft_expires": time.time() + 60}).encode())})
+    monkeypatch.setattr(uclient, "_redis_raw", fake_redis)
+
+    first = await uclient.cached_get_json(
+        mock_transport_client, "http://unused", {}, 60, "hot:key")
+    second = await uclient.cached_get_json(
+        mock_transport_client, "http://unused", {}, 60, "hot:key")
+    assert first == second == {"results": ["hot"]}
+    # the second read is served from the process-local cache
+    assert fake_redis.gets == 1
+
+    uclient.invalidate_responses()
+    await uclient.cached_get_json(
+        mock_transport_client, "http://unused", {}, 60, "hot:key")
+    assert fake_redis.gets == 2
+
+
+async def test_cached_get_json_stale_serves_and_refreshes(monkeypatch):
+    import asyncio
+    import time
+    from app.utils import utils_movies_client as uclient
+
+    fake_redis = _FakeRedis({"z:swr:key": uclient._compress(json.dumps(
+        {"data": {"results": ["stale"]},
+         "soft_expires": time.time() - 1}).encode())})
+    monkeypatch.setattr(uclient, "_redis_raw", fake_redis)
+
+    calls = {"get": 0}
+
+    # a counting client, so the test can assert exactly one refresh ran
+    class CountingClient:
+        async def get(self, url, params=None, **kwargs):
+            calls["get"] += 1
+            return httpx.Response(200, json={"results": ["fresh"]},
+                                  request=httpx.Request("GET", url))
+
+    # the stale payload is served immediately...
+    data = await uclient.cached_get_json(
+        CountingClient(), "http://origin", {}, 60, "swr:key")
+    assert data == {"results": ["stale"]}
+
+    # ...and a background task refreshes the cache entry
+    await asyncio.sleep(0.05)
+    assert calls["get"] == 1
+    value, _ = fake_redis.written["z:swr:key"]
+    assert json.loads(uclient._decompress(value))["data"] == {
+        "results": ["fresh"]}
+
+
+async def test_cached_get_json_coalesces_concurrent_misses(monkeypatch):
+    import asyncio
+    from app.utils import utils_movies_client as uclient
+
+    monkeypatch.setattr(uclient, "_redis_raw", _FakeRedis())
+
+    calls = {"get": 0}
+
+    # a deliberately slow client, so the concurrent misses overlap
+    class SlowClient:
+        async def get(self, url, params=None):
+            calls["get"] += 1
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"results": [{"id": 1}]},
+                                  request=httpx.Request("GET", url))
+
+    client = SlowClient()
+    results = await asyncio.gather(*[
+        uclient.cached_get_json(client, "http://origin", {}, 60, "same:key")
+        for _ in range(5)
+    ])
+    assert all(r == {"results": [{"id": 1}]} for r in results)
+    # all five concurrent misses collapse into a single upstream call
+    assert calls["get"] == 1
+
+
+# --- _fetch_omdb_data caching tests ---
+
+
+async def test_fetch_omdb_data_cache_hit(monkeypatch, mock_transport_client):
+    from app.utils import utils_movies_client as uclient
+
+    cached = json.dumps({"Response": "True", "Title": "Cached Movie"})
+    monkeypatch.setattr(
+        uclient, "_redis", _FakeRedis({"omdb:tt123": cached}, readonly=True))
+
+    data = await uclient._fetch_omdb_data(mock_transport_client, "tt123")
+    assert data["Title"] == "Cached Movie"
 
 
-@pytest.mark.asyncio
-async def test_get_search_results_http_error(dummy_client):
-    # stub to raise status
-    class BadResp:
-        status_code = 500
+async def test_fetch_omdb_data_caches_miss_sentinel(
+        monkeypatch, mock_transport_client, register_responses):
+    from app.utils import utils_movies_client as uclient
+
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(uclient, "_redis", fake_redis)
+
+    register_responses({
+        uclient.OMDB_BASE_URL: httpx.Response(
+            200, json={"Response": "False", "Error": "Movie not found!"})
+    })
+
+    data = await uclient._fetch_omdb_data(mock_transport_client, "tt999")
+    assert data is None
+    assert fake_redis.written["omdb:tt999"] == (
+        uclient._OMDB_MISS, uclient.CACHE_TTL_OMDB_MISS)
+
+    # a second lookup should be served from the sentinel, not OMDB
+    monkeypatch.setattr(
+        uclient, "_redis",
+        _FakeRedis({"omdb:tt999": uclient._OMDB_MISS}, readonly=True))
+    assert await uclient._fetch_omdb_data(
+        mock_transport_client, "tt999") is None
+
+
+async def test_fetch_omdb_data_coalesces_concurrent_misses(monkeypatch):
+    import asyncio
+    from app.utils import utils_movies_client as uclient
+
+    fake_redis = _FakeRedis()
+    monkeypatch.setattr(uclient, "_redis", fake_redis)
+
+    calls = {"get": 0}
+
+    # a deliberately slow client, so the concurrent misses overlap
+    class SlowClient:
+        async def get(self, url, params=None, **kwargs):
+            calls["get"] += 1
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                200, json={"Response": "True", "Title": "Once"},
+                request=httpx.Request("GET", url))
+
+    client = SlowClient()
+    results = await asyncio.gather(*[
+        uclient._fetch_omdb_data(client, "tt777") for _ in range(5)
+    ])
+    assert all(r["Title"] == "Once" for r in results)
+    # the same title appearing five times in a page costs one OMDB call
+    assert calls["get"] == 1
+
+
+async def test_fetch_omdb_data_l1_short_circuits_redis(
+        monkeypatch, mock_transport_client):
+    from app.utils import utils_movies_client as uclient
+
+    cached = json.dumps({"Response": "True", "Title": "Hot Movie"})
+    fake_redis = _FakeRedis({"omdb:tt555": cached})
+    monkeypatch.setattr(uclient, "_redis", fake_redis)
+
+    first = await uclient._fetch_omdb_data(mock_transport_client, "tt555")
+    second = await uclient._fetch_omdb_data(mock_transport_client, "tt555")
+    assert first["Title"] == second["Title"] == "Hot Movie"
+    # the second lookup is served from the process-local cache
+    assert fake_redis.gets == 1
+
+    # the miss sentinel is memoized the same way
+    fake_redis = _FakeRedis({"omdb:tt556": uclient._OMDB_MISS})
+    monkeypatch.setattr(uclient, "_redis", fake_redis)
+    assert await uclient._fetch_omdb_data(
+        mock_transport_client, "tt556") is None
+    assert await uclient._fetch_omdb_data(
+        mock_transport_client, "tt556") is None
+    assert fake_redis.gets == 1
+
+
+# --- get_popular caching tests ---
+
+
+async def test_get_popular_l1_short_circuits_redis(
+        monkeypatch, mock_transport_client):
+    from app.utils import utils_movies_client as uclient
+
+    items = [{"id": 1, "title": "Pop"}]
+    fake_redis = _FakeRedis(
+        {"z:popular:movie": uclient._compress(json.dumps(items).encode())})
+    monkeypatch.setattr(uclient, "_redis_raw", fake_redis)
+
+    first = await uclient.get_popular(mock_transport_client, is_series=False)
+    second = await uclient.get_popular(mock_transport_client, is_series=False)
+    assert first == second == items
+    # the second read skips Redis (and the decompress + parse) entirely
+    assert fake_redis.gets == 1
+
+    uclient.invalidate_responses()
+    await uclient.get_popular(mock_transport_client, is_series=False)
+    assert fake_redis.gets == 2
+
+
+# --- error propagation ---
 
-        def raise_for_status(self):
-            raise HTTPStatusError("Error", request=None, response=None)
 
-        def json(self): return {}
+async def test_get_search_results_http_error(
+        mock_transport_client, register_responses):
+    from app.utils import utils_movies_client as uclient
 
-    async def fake_get(*args, **kwargs):
-        return BadResp()
-    client = DummyClient({})
-    client.get = fake_get
+    register_responses({
+        f"{uclient.BASE_URL}/search/movie": httpx.Response(500, json={})
+    })
     with pytest.raises(HTTPStatusError):
-        await get_search_results(client, "x", is_series=False)
+        await get_search_results(mock_transport_client, "x", is_series=False)
 
 # --- discover_by_filters: movie branch ---
 
 
-@pytest.mark.asyncio
-async def test_discover_movie_by_filters_genre_only(monkeypatch):
+async def test_discover_movie_by_filters_genre_only(
+        monkeypatch, mock_transport_client, register_responses):
     # stub fetch_genres
     from app.utils import utils_movies_client as uclient
 
@@ -115,44 +372,36 @@ async def test_discover_movie_by_filters_genre_only(monkeypatch):
         return {5: "Drama"}
     monkeypatch.setattr(uclient, "fetch_genres", fake_fetch_genres)
 
-    # fake client.get for discover
-    class FakeResp:
-        status_code = 200
-        def raise_for_status(self): pass
-        def json(self): return {"results": [{"id": 7}]}
-    dummy = DummyClient({f"{uclient.BASE_URL}/discover/movie": FakeResp()})
-    results, endpoint = await _discover_movie_by_filters(dummy, genre="Drama", actors=None)
+    register_responses({
+        f"{uclient.BASE_URL}/discover/movie": httpx.Response(
+            200, json={"results": [{"id": 7}]})
+    })
+    results, endpoint = await _discover_movie_by_filters(
+        mock_transport_client, genre="Drama", actors=None)
     assert endpoint == "movie"
     assert isinstance(results, list) and results[0]["id"] == 7
 
 
-@pytest.mark.asyncio
-async def test_discover_movie_by_filters_actors_only(monkeypatch):
+async def test_discover_movie_by_filters_actors_only(
+        mock_transport_client, register_responses):
     from app.utils import utils_movies_client as uclient
-    # stub person search
-
-    class PersonResp:
-        status_code = 200
-        def raise_for_status(self): pass
-        def json(self): return {"results": [{"id": 42}]}
-
-    class DiscResp:
-        status_code = 200
-        def raise_for_status(self): pass
-        def json(self): return {"results": [{"id": 8}]}
-    dummy = DummyClient({
-        f"{uclient.BASE_URL}/search/person": PersonResp(),
-        f"{uclient.BASE_URL}/discover/movie": DiscResp()
+
+    register_responses({
+        f"{uclient.BASE_URL}/search/person": httpx.Response(
+            200, json={"results": [{"id": 42}]}),
+        f"{uclient.BASE_URL}/discover/movie": httpx.Response(
+            200, json={"results": [{"id": 8}]})
     })
-    res, ep = await _discover_movie_by_filters(dummy, genre=None, actors="Someone")
+    res, ep = await _discover_movie_by_filters(
+        mock_transport_client, genre=None, actors="Someone")
     assert ep == "movie"
     assert res[0]["id"] == 8
 
 # --- discover_by_filters: series branch ---
 
 
-@pytest.mark.asyncio
-async def test_discover_tv_by_filters_genre_only(monkeypatch):
+async def test_discover_tv_by_filters_genre_only(
+        monkeypatch, mock_transport_client, register_responses):
     from app.utils import utils_movies_client as uclient
     # stub genre fetcher
 
@@ -161,43 +410,36 @@ async def test_discover_tv_by_filters_genre_only(monkeypatch):
     monkeypatch.setattr(uclient, "fetch_genres", fake_fetch_genres)
 
     # stub TV discover endpoint
-    class FakeResp:
-        status_code = 200
-        def raise_for_status(self): pass
-        def json(self): return {"results": [{"id": 77}]}
-
-    dummy = DummyClient({f"{uclient.BASE_URL}/discover/tv": FakeResp()})
-    res, ep = await _discover_tv_by_filters(dummy, genre="Documentary", actors=None)
+    register_responses({
+        f"{uclient.BASE_URL}/discover/tv": httpx.Response(
+            200, json={"results": [{"id": 77}]})
+    })
+    res, ep = await _discover_tv_by_filters(
+        mock_transport_client, genre="Documentary", actors=None)
     assert ep == "tv"
     assert res[0]["id"] == 77
 
 
-@pytest.mark.asyncio
-async def test_discover_tv_by_filters_actors_only(monkeypatch):
+async def test_discover_tv_by_filters_actors_only(
+        mock_transport_client, register_responses):
     from app.utils import utils_movies_client as uclient
 
-    class PersonResp:
-        status_code = 200
-        def raise_for_status(self): pass
-        def json(self): return {"results": [{"id": 314}]}
-
-    class CreditResp:
-        status_code = 200
-        def raise_for_status(self): pass
-        def json(self): return {"cast": [{"id": 271}]}  # mocked TV show result
-
-    dummy = DummyClient({
-        f"{uclient.BASE_URL}/search/person": PersonResp(),
-        f"{uclient.BASE_URL}/person/314/tv_credits": CreditResp()
+    register_responses({
+        f"{uclient.BASE_URL}/search/person": httpx.Response(
+            200, json={"results": [{"id": 314}]}),
+        # mocked TV show result
+        f"{uclient.BASE_URL}/person/314/tv_credits": httpx.Response(
+            200, json={"cast": [{"id": 271}]})
     })
 
-    results, endpoint = await _discover_tv_by_filters(dummy, genre=None, actors="Some Actor")
+    results, endpoint = await _discover_tv_by_filters(
+        mock_transport_client, genre=None, actors="Some Actor")
     assert endpoint == "tv"
     assert results[0]["id"] == 271
 
 
-@pytest.mark.asyncio
-async def test_discover_tv_by_filters_genre_and_actors(monkeypatch):
+async def test_discover_tv_by_filters_genre_and_actors(
+        monkeypatch, mock_transport_client, register_responses):
     from app.utils import utils_movies_client as uclient
 
     # Stub fetch_genres to map ID -> name
@@ -205,31 +447,20 @@ async def test_discover_tv_by_filters_genre_and_actors(monkeypatch):
         return {99: "Documentary", 55: "Sci-Fi"}
     monkeypatch.setattr(uclient, "fetch_genres", fake_fetch_genres)
 
-    # Stub person search
-    class PersonResp:
-        status_code = 200
-        def raise_for_status(self): pass
-        def json(self): return {"results": [{"id": 1234}]}
-
-    # Stub tv_credits
-    class CreditsResp:
-        status_code = 200
-        def raise_for_status(self): pass
-
-        def json(self): return {
-            "cast": [
-                {"id": 7, "genre_ids": [99]},
-                {"id": 9, "genre_ids": [123]},
-            ]
-        }
-
-    dummy = DummyClient({
-        f"{uclient.BASE_URL}/search/person": PersonResp(),
-        f"{uclient.BASE_URL}/person/1234/tv_credits": CreditsResp()
+    register_responses({
+        f"{uclient.BASE_URL}/search/person": httpx.Response(
+            200, json={"results": [{"id": 1234}]}),
+        f"{uclient.BASE_URL}/person/1234/tv_credits": httpx.Response(
+            200, json={
+                "cast": [
+                    {"id": 7, "genre_ids": [99]},
+                    {"id": 9, "genre_ids": [123]},
+                ]
+            })
     })
 
     results, endpoint = await uclient._discover_tv_by_filters(
-        dummy,
+        mock_transport_client,
         genre="Documentary",
         actors="Test Actor"
     )
@@ -240,55 +471,133 @@ async def test_discover_tv_by_filters_genre_and_actors(monkeypatch):
     assert results[0]["id"] == 7
 
 
-# --- map_to_movie tests ---
+# --- _fetch_details tests ---
+
+
+async def test_fetch_details_single_call_yields_cast_and_imdb_id(
+        monkeypatch, mock_transport_client, register_responses):
+    from app.utils import utils_movies_client as uclient
 
+    monkeypatch.setattr(uclient, "_redis", _FakeRedis())
 
-@pytest.mark.asyncio
-async def test_map_to_movie_no_imdb(monkeypatch, dummy_client):
-    # stub credits and imdb lookup so no imdb
+    register_responses({
+        f"{uclient.BASE_URL}/tv/55": httpx.Response(200, json={
+            "imdb_id": None,
+            "external_ids": {"imdb_id": "tt777"},
+            "credits": {"cast": [{"name": "Jane Doe"}, {"name": None}]},
+        })
+    })
+
+    actors, imdb_id = await uclient._fetch_details(
+        mock_transport_client, "tv", 55)
+    assert actors == ["Jane Doe"]
+    assert imdb_id == "tt777"
+
+
+async def test_prefetch_cached_details_batches_page_reads(monkeypatch):
+    import asyncio
+    import time
     from app.utils import utils_movies_client as uclient
-    async def fake_credits(c, t, i): return []
-    async def fake_get_imdb(c, t, i): return None
-    monkeypatch.setattr(uclient, "_fetch_credits", fake_credits)
-    monkeypatch.setattr(uclient, "_get_imdb_id", fake_get_imdb)
-    # prepare a TMDB item without poster_path
-    item = {"id": 100, "title": "X",
-            "release_date": "2000-01-01", "genre_ids": [], }
-    m = await map_to_movie(item, "movie", {}, MovieSearchParams(), dummy_client)
-    assert m.source == "TMDB"
-    assert m.id == str(100)
-
-
-@pytest.mark.asyncio
-async def test_map_to_movie_with_omdb(monkeypatch, dummy_client):
+
+    fresh = uclient._compress(json.dumps(
+        {"data": {"credits": {"cast": [{"name": "Ann"}]}, "imdb_id": "tt1"},
+         "soft_expires": time.time() + 60}).encode())
+    stale = uclient._compress(json.dumps(
+        {"data": {"credits": {"cast": [{"name": "Bea"}]}, "imdb_id": "tt2"},
+         "soft_expires": time.time() - 1}).encode())
+    fake_redis = _FakeRedis({
+        "z:tmdb:full:movie:1": fresh,
+        "z:tmdb:full:movie:2": stale,
+    })
+    monkeypatch.setattr(uclient, "_redis_raw", fake_redis)
+
+    calls = {"get": 0}
+
+    # a counting client, so the test can pin down which path fetched
+    class CountingClient:
+        async def get(self, url, params=None, **kwargs):
+            calls["get"] += 1
+            return httpx.Response(
+                200, json={"credits": {"cast": [{"name": "Bea"}]},
+                           "imdb_id": "tt2"},
+                request=httpx.Request("GET", url))
+
+    client = CountingClient()
+    prefetched = await uclient.prefetch_cached_details(
+        [({"id": 1}, "movie"), ({"id": 2}, "movie")])
+    # the whole page costs one MGET; only the fresh entry is prefetched
+    assert fake_redis.mgets == 1
+    assert set(prefetched) == {"tmdb:full:movie:1"}
+
+    # the fresh entry is served from the prefetch: no HTTP, no extra GET
+    actors, imdb_id = await uclient._fetch_details(
+        client, "movie", 1, prefetched)
+    assert (actors, imdb_id) == (["Ann"], "tt1")
+    assert calls["get"] == 0
+    assert fake_redis.gets == 0
+
+    # the stale entry falls through to cached_get_json, which serves it
+    # while a background task refreshes the cache entry
+    actors, imdb_id = await uclient._fetch_details(
+        client, "movie", 2, prefetched)
+    assert (actors, imdb_id) == (["Bea"], "tt2")
+    await asyncio.sleep(0.05)
+    assert calls["get"] == 1
+
+
+# --- map_to_movie tests ---
+
+
+_OMDB_FULL = {
+    "Response": "True",
+    "Director": "Dir Name",
+    "Runtime": "120 min",
+    "Plot": "Plot here",
+    "Poster": "OMDBPOSTER",
+    "Ratings": [{"Source": "SourceA", "Value": "9/10"}],
+    "Year": "1999",
+    "Title": "Override Title",
+}
+
+
+@pytest.mark.parametrize(
+    "imdb_id,omdb,expected_source,expected_id",
+    [
+        (None, None, "TMDB", "101"),
+        ("tt123", None, "TMDB", "tt123"),
+        ("tt123", _OMDB_FULL, "Merged", "tt123"),
+    ],
+    ids=["no_imdb", "imdb_without_omdb", "merged"],
+)
+async def test_map_to_movie_source_matrix(
+        monkeypatch, mock_transport_client,
+        imdb_id, omdb, expected_source, expected_id):
     from app.utils import utils_movies_client as uclient
-    # stub credits
-    async def fake_credits(c, t, i): return ["Actor A"]
-    async def fake_get_imdb(c, t, i): return "tt123"
+
+    omdb_calls = {"n": 0}
+
+    # stub the combined details lookup
+    async def fake_details(c, t, i, p=None): return ["Actor A"], imdb_id
 
     async def fake_omdb(c, i):
-        return {
-            "Response": "True",
-            "Director": "Dir Name",
-            "Runtime": "120 min",
-            "Plot": "Plot here",
-            "Poster": "OMDBPOSTER",
-            "Ratings": [{"Source": "SourceA", "Value": "9/10"}],
-            "Year": "1999",
-            "Title": "Override Title"
-        }
-    monkeypatch.setattr(uclient, "_fetch_credits", fake_credits)
-    monkeypatch.setattr(uclient, "_get_imdb_id", fake_get_imdb)
+        omdb_calls["n"] += 1
+        return omdb
+    monkeypatch.setattr(uclient, "_fetch_details", fake_details)
     monkeypatch.setattr(uclient, "_fetch_omdb_data", fake_omdb)
     # item with poster_path
     item = {"id": 101, "title": None, "first_air_date": "",
             "genre_ids": [], "poster_path": "/p.jpg"}
-    m = await map_to_movie(item, "movie", {}, MovieSearchParams(), dummy_client)
-    assert m.source == "Merged"
-    assert m.title == "Override Title"
-    assert m.director == "Dir Name"
-    assert m.runtime == "120 min"
-    assert m.plot == "Plot here"
-    assert m.ratings == {"SourceA": "9/10"}
+    m = await map_to_movie(
+        item, "movie", {}, MovieSearchParams(), mock_transport_client)
+    assert m.source == expected_source
+    assert m.id == expected_id
+    # items without an IMDB id return before the OMDB lookup runs
+    assert omdb_calls["n"] == (1 if imdb_id else 0)
+    if omdb:
+        assert m.title == "Override Title"
+        assert m.director == "Dir Name"
+        assert m.runtime == "120 min"
+        assert m.plot == "Plot here"
+        assert m.ratings == {"SourceA": "9/10"}
     # TMDB poster takes precedence
     assert m.poster_url.endswith("/p.jpg")